@@ -64,6 +64,7 @@ setup(
     extras_require={
         'docs': ['Sphinx', 'sphinx-autobuild', 'alabaster'],
         'quality': ['pylama', 'isort', 'eradicate', 'mypy', 'black', 'bandit'],
+        'orjson': ['orjson'],
     },
     install_requires=[
         "oidcmsg>=0.6.10",
@@ -1,6 +1,5 @@
 import logging
 from functools import cmp_to_key
-from urllib.parse import urlparse
 
 from cryptojwt import jwe
 from cryptojwt.jws.jws import SIGNER_ALGS
@@ -15,6 +14,7 @@ from oidcendpoint.client_authn import client_auth_setup
 from oidcendpoint.client_authn import verify_client
 from oidcendpoint.exception import UnAuthorizedClient
 from oidcendpoint.util import OAUTH2_NOCACHE_HEADERS
+from oidcendpoint.util import json_dumps
 
 __author__ = "Roland Hedberg"
 
@@ -30,11 +30,10 @@ parse_request
 process_request
 
 do_response
-    - response_info
-        - construct
-            - pre_construct (*)
-            - _parse_args
-            - post_construct (*)
+    - construct (or response_info if a subclass defines it)
+        - pre_construct (*)
+        - _parse_args
+        - post_construct (*)
     - update_http_args
 
 do_response returns a dictionary that can look like this:
@@ -59,6 +58,15 @@ do_response returns a dictionary that can look like this:
 
 
 def set_content_type(headers, content_type):
+    """
+    Set the Content-type header, replacing any previous value.
+
+    :param headers: HTTP headers, a list of (name, value) tuples. A header
+        name may be repeated.
+    :param content_type: The content type
+    :return: The headers as given if they already carry the content type,
+        otherwise a new list
+    """
     if ("Content-type", content_type) in headers:
         return headers
 
@@ -67,6 +75,30 @@ def set_content_type(headers, content_type):
     return _headers
 
 
+def _freeze(item):
+    """
+    Convert a structure of dictionaries and lists into something that
+    can be compared and hashed.
+    """
+    if isinstance(item, (dict, Message)):
+        return tuple(sorted((k, _freeze(v)) for k, v in item.items()))
+    elif isinstance(item, (list, tuple, set)):
+        return tuple(_freeze(v) for v in item)
+    return item
+
+
+def _to_json(response):
+    return json_dumps(response.to_dict(1))
+
+
+def _to_jose(response):
+    return response
+
+
+def _to_urlencoded(response):
+    return response.to_urlencoded()
+
+
 def fragment_encoding(return_type):
     if return_type == ["code"]:
         return False
@@ -156,6 +188,14 @@ class Endpoint(object):
     response_placement = "body"
     client_authn_method = ""
     default_capabilities = None
+    # The serialized response can be reused as long as response_args and
+    # endpoint_context.config_version are unchanged. A cacheable endpoint's
+    # output must not depend on the request, and its construct hooks may only
+    # use configuration covered by config_version.
+    cacheable_response = False
+    # Endpoints that validate a request by other means than the message
+    # schema, for instance by token introspection, can skip request.verify()
+    skip_verify = False
 
     def __init__(self, endpoint_context, **kwargs):
         self.endpoint_context = endpoint_context
@@ -164,6 +204,12 @@ class Endpoint(object):
         self.post_parse_request = []
         self.kwargs = kwargs
         self.full_path = ""
+        self._response_cache = None
+        self._body_format = None
+        self._log_prefix = "- {} -".format(self.endpoint_name)
+        # A subclass may still define response_info, otherwise construct
+        # is used directly.
+        self._response_info = getattr(self, "response_info", self.construct)
 
         for param in [
             "request_cls",
@@ -203,8 +249,10 @@ class Endpoint(object):
         :param kwargs: extra keyword arguments
         :return:
         """
-        LOGGER.debug("- {} -".format(self.endpoint_name))
-        LOGGER.info("Request: %s" % sanitize(request))
+        LOGGER.debug(self._log_prefix)
+        # sanitize() walks the whole request, only do it if it will be logged
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info("Request: %s", sanitize(request))
 
         if request:
             if isinstance(request, (dict, Message)):
@@ -220,8 +268,10 @@ class Endpoint(object):
                         **kwargs
                     )
                 elif self.request_format == "url":
-                    parts = urlparse(request)
-                    scheme, netloc, path, params, query, fragment = parts[:6]
+                    # Only the query component is of interest, drop the
+                    # fragment first since it may contain '?'
+                    _url, _, _ = request.partition("#")
+                    _, _, query = _url.partition("?")
                     req = _cls_inst.deserialize(query, "urlencoded")
                 else:
                     req = _cls_inst.deserialize(request, self.request_format)
@@ -251,12 +301,14 @@ class Endpoint(object):
         keyjar = self.endpoint_context.keyjar
 
         # verify that the request message is correct
-        try:
-            req.verify(keyjar=keyjar, opponent_id=_client_id)
-        except (MissingRequiredAttribute, ValueError, MissingRequiredValue) as err:
-            return self.error_cls(error="invalid_request", error_description="%s" % err)
+        if not self.skip_verify:
+            try:
+                req.verify(keyjar=keyjar, opponent_id=_client_id)
+            except (MissingRequiredAttribute, ValueError, MissingRequiredValue) as err:
+                return self.error_cls(error="invalid_request", error_description="%s" % err)
 
-        LOGGER.info("Parsed and verified request: %s" % sanitize(req))
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info("Parsed and verified request: %s", sanitize(req))
 
         # Do any endpoint specific parsing
         return self.do_post_parse_request(req, _client_id, **kwargs)
@@ -294,25 +346,31 @@ class Endpoint(object):
         return authn_info
 
     def do_post_parse_request(self, request, client_id="", **kwargs):
+        if not self.post_parse_request:
+            return request
+
+        _context = self.endpoint_context
         for meth in self.post_parse_request:
-            request = meth(
-                request, client_id, endpoint_context=self.endpoint_context, **kwargs
-            )
+            request = meth(request, client_id, endpoint_context=_context, **kwargs)
         return request
 
     def do_pre_construct(self, response_args, request, **kwargs):
+        if not self.pre_construct:
+            return response_args
+
+        _context = self.endpoint_context
         for meth in self.pre_construct:
-            response_args = meth(
-                response_args, request, endpoint_context=self.endpoint_context, **kwargs
-            )
+            response_args = meth(response_args, request, endpoint_context=_context, **kwargs)
 
         return response_args
 
     def do_post_construct(self, response_args, request, **kwargs):
+        if not self.post_construct:
+            return response_args
+
+        _context = self.endpoint_context
         for meth in self.post_construct:
-            response_args = meth(
-                response_args, request, endpoint_context=self.endpoint_context, **kwargs
-            )
+            response_args = meth(response_args, request, endpoint_context=_context, **kwargs)
 
         return response_args
 
@@ -340,29 +398,77 @@ class Endpoint(object):
 
         return self.do_post_construct(response, request, **kwargs)
 
-    def response_info(self, response_args, request, **kwargs):
-        return self.construct(response_args, request, **kwargs)
+    def _body_serializer(self):
+        """
+        Find the content type and serializer for a response that is placed
+        in the HTTP body. Only resolved again if the response or request
+        format has changed.
+
+        :return: A tuple of content type and serializer function
+        """
+        _key = (self.response_format, self.request_format)
+        if self._body_format is None or self._body_format[0] != _key:
+            if self.response_format == "json":
+                _pair = ("application/json", _to_json)
+            elif self.request_format in ["jws", "jwe", "jose"]:
+                _pair = ("application/jose", _to_jose)
+            else:
+                _pair = ("application/x-www-form-urlencoded", _to_urlencoded)
+            self._body_format = (_key, _pair)
+
+        return self._body_format[1]
+
+    def _cached_response(self, response_args, request, **kwargs):
+        """
+        Construct and serialize the response once per set of response
+        arguments and configuration version.
+
+        :param response_args: response arguments
+        :param request: The parsed request, a self.request_cls class instance
+        :param kwargs: Extra keyword arguments
+        :return: The serialized response
+        """
+        _key = (
+            self.endpoint_context.config_version,
+            self.response_format,
+            kwargs.get("content_type"),
+            _freeze(response_args),
+        )
+        if self._response_cache is None or self._response_cache[0] != _key:
+            _response = self._response_info(response_args, request, **kwargs)
+            _, _serialize = self._body_serializer()
+            resp = _serialize(_response)
+            self._response_cache = (_key, resp)
+
+        return self._response_cache[1]
 
     def do_response(self, response_args=None, request=None, error="", **kwargs):
         """
 
         """
+        if response_args is None:
+            response_args = {}
+
+        if (
+            self.cacheable_response
+            and self.response_placement == "body"
+            and not error
+            and "response_msg" not in kwargs
+        ):
+            kwargs["response_msg"] = self._cached_response(response_args, request, **kwargs)
+
         do_placement = True
         content_type = "text/html"
         _resp = {}
         _response_placement = None
-        if response_args is None:
-            response_args = {}
 
         LOGGER.debug("do_response kwargs: %s", kwargs)
 
         resp = None
         if error:
             _response = ResponseMessage(error=error)
-            try:
+            if "error_description" in kwargs:
                 _response["error_description"] = kwargs["error_description"]
-            except KeyError:
-                pass
         elif "response_msg" in kwargs:
             resp = kwargs["response_msg"]
             _response_placement = kwargs.get('response_placement')
@@ -370,34 +476,21 @@ class Endpoint(object):
             _response = ""
             content_type = kwargs.get('content_type')
             if content_type is None:
-                if self.response_format == "json":
-                    content_type = "application/json"
-                elif self.request_format in ["jws", "jwe", "jose"]:
-                    content_type = "application/jose"
-                else:
-                    content_type = "application/x-www-form-urlencoded"
+                content_type, _ = self._body_serializer()
         else:
-            _response = self.response_info(response_args, request, **kwargs)
+            _response = self._response_info(response_args, request, **kwargs)
 
         if do_placement:
             content_type = kwargs.get('content_type')
             if content_type is None:
                 if self.response_placement == "body":
-                    if self.response_format == "json":
-                        content_type = "application/json"
-                        resp = _response.to_json()
-                    elif self.request_format in ["jws", "jwe", "jose"]:
-                        content_type = "application/jose"
-                        resp = _response
-                    else:
-                        content_type = "application/x-www-form-urlencoded"
-                        resp = _response.to_urlencoded()
+                    content_type, _serialize = self._body_serializer()
+                    resp = _serialize(_response)
                 elif self.response_placement == "url":
                     # content_type = 'application/x-www-form-urlencoded'
                     content_type = ""
-                    try:
-                        fragment_enc = kwargs["fragment_enc"]
-                    except KeyError:
+                    fragment_enc = kwargs.get("fragment_enc")
+                    if fragment_enc is None:
                         _ret_type = kwargs.get("return_type")
                         if _ret_type:
                             fragment_enc = fragment_encoding(_ret_type)
@@ -413,28 +506,20 @@ class Endpoint(object):
                         "Don't know where that is: '{}".format(self.response_placement)
                     )
 
+        http_headers = kwargs.get("http_headers") or []
         if content_type:
-            try:
-                http_headers = set_content_type(kwargs["http_headers"], content_type)
-            except KeyError:
-                http_headers = [("Content-type", content_type)]
-        else:
-            try:
-                http_headers = kwargs["http_headers"]
-            except KeyError:
-                http_headers = []
+            http_headers = set_content_type(http_headers, content_type)
 
         if _response_placement:
             _resp["response_placement"] = _response_placement
 
-        http_headers.extend(OAUTH2_NOCACHE_HEADERS)
+        # Build a new list, the caller's list must not be modified
+        http_headers = [*http_headers, *OAUTH2_NOCACHE_HEADERS]
 
         _resp.update({"response": resp, "http_headers": http_headers})
 
-        try:
+        if "cookie" in kwargs:
             _resp["cookie"] = kwargs["cookie"]
-        except KeyError:
-            pass
 
         return _resp
 
@@ -128,6 +128,10 @@ class EndpointContext:
         self.login_hint_lookup = None
         self.login_hint2acrs = None
         self.userinfo = None
+        # Must be increased whenever configuration that endpoints use when
+        # constructing a response, for instance the endpoint paths, is changed
+        # at run time. Invalidates cached responses.
+        self.config_version = 0
         self.scope2claims = SCOPE2CLAIMS
         # arguments for endpoints add-ons
         self.args = {}
@@ -51,6 +51,10 @@ class JWTToken(Token):
         for param, default in self.init_args.items():
             setattr(self, param, kwargs.get(param, default))
 
+        # The verifier holds no per-token state and looks up keys in the
+        # key jar on every unpack, so one instance can be reused.
+        self.verifier = JWT(key_jar=self.key_jar, allowed_sign_algs=[self.alg])
+
     def do_add_claims(self, payload, uinfo, claims):
         for attr in claims:
             if attr == "sub":
@@ -116,9 +120,8 @@ class JWTToken(Token):
         :param token: A token
         :return: tuple of token type and session id
         """
-        verifier = JWT(key_jar=self.key_jar, allowed_sign_algs=[self.alg])
         try:
-            _payload = verifier.unpack(token)
+            _payload = self.verifier.unpack(token)
         except JWSException:
             raise UnknownToken()
 
@@ -142,8 +145,7 @@ class JWTToken(Token):
             0 means now.
         :return: True/False
         """
-        verifier = JWT(key_jar=self.key_jar, allowed_sign_algs=[self.alg])
-        _payload = verifier.unpack(token)
+        _payload = self.verifier.unpack(token)
         return is_expired(_payload["exp"], when)
 
     def gather_args(self, sid, sdb, udb):
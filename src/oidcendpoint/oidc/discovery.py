@@ -3,6 +3,7 @@ from oidcmsg.oidc import JRD
 from oidcmsg.oidc import Link
 
 from oidcendpoint.endpoint import Endpoint
+from oidcendpoint.util import json_dumps
 
 OIC_ISSUER = "http://openid.net/specs/connect/1.0/issuer"
 
@@ -14,9 +15,15 @@ class Discovery(Endpoint):
     response_format = "json"
     name = "discovery"
 
+    def __init__(self, endpoint_context, **kwargs):
+        Endpoint.__init__(self, endpoint_context, **kwargs)
+        # The serialized links, only depends on the hrefs
+        self._links = None
+
     def do_response(self, response_args=None, request=None, **kwargs):
         """
-        **Placeholder for the time being**
+        Construct a JRD response. Only the subject varies between requests
+        so the links are serialized once and reused.
 
         :param response_args:
         :param request:
@@ -24,12 +31,18 @@ class Discovery(Endpoint):
         :return: Response information
         """
 
-        links = [Link(href=h, rel=OIC_ISSUER) for h in kwargs["hrefs"]]
+        _hrefs = tuple(kwargs["hrefs"])
+        if self._links is None or self._links[0] != _hrefs:
+            _links = [Link(href=h, rel=OIC_ISSUER).to_dict() for h in _hrefs]
+            self._links = (_hrefs, json_dumps(_links))
 
-        _response = JRD(subject=kwargs["subject"], links=links)
+        # The subject comes from the request so it must be JSON encoded
+        _response = '{{"subject": {}, "links": {}}}'.format(
+            json_dumps(kwargs["subject"]), self._links[1]
+        )
 
         info = {
-            "response": _response.to_json(),
+            "response": _response,
             "http_headers": [("Content-type", "application/json")],
         }
 
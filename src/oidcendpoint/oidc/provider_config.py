@@ -13,6 +13,7 @@ class ProviderConfiguration(Endpoint):
     request_format = ""
     response_format = "json"
     name = "provider_config"
+    cacheable_response = True
     default_capabilities = {"require_request_uri_registration": None}
 
     def __init__(self, endpoint_context, **kwargs):
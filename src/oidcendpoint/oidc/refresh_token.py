@@ -88,12 +88,7 @@ class RefreshAccessToken(Endpoint):
 
         request = RefreshAccessTokenRequest(**request.to_dict())
 
-        try:
-            keyjar = self.endpoint_context.keyjar
-        except AttributeError:
-            keyjar = ""
-
-        request.verify(keyjar=keyjar, opponent_id=client_id)
+        request.verify(keyjar=self.endpoint_context.keyjar, opponent_id=client_id)
 
         if "client_id" not in request:  # Optional for refresh access token request
             request["client_id"] = client_id
@@ -182,12 +182,7 @@ class TokenCoop(Endpoint):
         except (MissingRequiredAttribute, ValueError, MissingRequiredValue) as err:
             return self.error_cls(error="invalid_request", error_description="%s" % err)
 
-        try:
-            keyjar = self.endpoint_context.keyjar
-        except AttributeError:
-            keyjar = ""
-
-        request.verify(keyjar=keyjar, opponent_id=client_id)
+        request.verify(keyjar=self.endpoint_context.keyjar, opponent_id=client_id)
 
         if "client_id" not in request:  # Optional for refresh access token request
             request["client_id"] = client_id
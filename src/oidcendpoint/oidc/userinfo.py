@@ -1,4 +1,3 @@
-import json
 import logging
 
 from cryptojwt.exception import MissingValue
@@ -11,6 +10,7 @@ from oidcmsg.time_util import time_sans_frac
 from oidcendpoint.endpoint import Endpoint
 from oidcendpoint.userinfo import collect_user_info
 from oidcendpoint.util import OAUTH2_NOCACHE_HEADERS
+from oidcendpoint.util import json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -84,13 +84,12 @@ class UserInfo(Endpoint):
             content_type = "application/jwt"
         else:
             if isinstance(response_args, dict):
-                resp = json.dumps(response_args)
+                resp = json_dumps(response_args)
             else:
-                resp = response_args.to_json()
+                resp = json_dumps(response_args.to_dict(1))
             content_type = "application/json"
 
-        http_headers = [("Content-type", content_type)]
-        http_headers.extend(OAUTH2_NOCACHE_HEADERS)
+        http_headers = [("Content-type", content_type), *OAUTH2_NOCACHE_HEADERS]
 
         return {"response": resp, "http_headers": http_headers}
 
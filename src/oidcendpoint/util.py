@@ -5,9 +5,33 @@ from urllib.parse import parse_qs
 from urllib.parse import urlsplit
 from urllib.parse import urlunsplit
 
+# orjson is optional, if available it's used for serializing responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-OAUTH2_NOCACHE_HEADERS = [("Pragma", "no-cache"), ("Cache-Control", "no-store")]
+# A tuple so it can't be modified by mistake when extending a header list
+OAUTH2_NOCACHE_HEADERS = (("Pragma", "no-cache"), ("Cache-Control", "no-store"))
+
+
+def json_dumps(info):
+    """
+    Serialize a dictionary into a JSON document.
+
+    :param info: A dictionary
+    :return: A JSON document as a string
+    """
+    if orjson:
+        try:
+            return orjson.dumps(info, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Things orjson can't handle but json can, like integers
+            # larger than 64 bits.
+            pass
+    return json.dumps(info)
 
 
 def modsplit(s):
@@ -1,9 +1,12 @@
+import json
+
 from oidcendpoint.oidc.authorization import Authorization
 from oidcendpoint.oidc.provider_config import ProviderConfiguration
 from oidcendpoint.oidc.registration import Registration
 from oidcendpoint.oidc.token import AccessToken
 from oidcendpoint.oidc.userinfo import UserInfo
 from oidcendpoint.user_authn.authn_context import INTERNETPROTOCOLPASSWORD
+from oidcendpoint.util import json_dumps
 
 KEYDEFS = [
     {"type": "RSA", "key": "", "use": ["sig"]},
@@ -56,3 +59,11 @@ conf = {
     },
     "template_dir": "template",
 }
+
+
+def test_json_dumps_non_str_keys():
+    assert json.loads(json_dumps({1: "a", "b": 2})) == {"1": "a", "b": 2}
+
+
+def test_json_dumps_big_int():
+    assert json.loads(json_dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
@@ -3,9 +3,12 @@ from urllib.parse import urlparse
 
 import pytest
 from oidcendpoint.endpoint import Endpoint
+from oidcendpoint.endpoint import set_content_type
 from oidcendpoint.endpoint_context import EndpointContext
 from oidcendpoint.user_authn.authn_context import INTERNETPROTOCOLPASSWORD
 from oidcmsg.message import Message
+from oidcmsg.oauth2 import AuthorizationRequest
+from oidcmsg.oauth2 import ResponseMessage
 
 KEYDEFS = [
     {"type": "RSA", "key": "", "use": ["sig"]},
@@ -38,6 +41,27 @@ def test_endpoint_init():
     assert endp
 
 
+def test_set_content_type_repeated_header():
+    headers = [("Set-Cookie", "a=1"), ("Content-type", "text/html"), ("Set-Cookie", "b=2")]
+    assert set_content_type(headers, "application/json") == [
+        ("Set-Cookie", "a=1"),
+        ("Set-Cookie", "b=2"),
+        ("Content-type", "application/json"),
+    ]
+
+
+def test_set_content_type_unchanged():
+    headers = [("Content-type", "application/json"), ("Set-Cookie", "a=1")]
+    assert set_content_type(headers, "application/json") is headers
+
+
+class InfoEndpoint(Endpoint):
+    def response_info(self, response_args, request, **kwargs):
+        response = self.construct(response_args, request, **kwargs)
+        response["extra"] = "value"
+        return response
+
+
 class TestEndpoint(object):
     @pytest.fixture(autouse=True)
     def create_endpoint(self):
@@ -79,6 +103,14 @@ class TestEndpoint(object):
         req = self.endpoint.parse_request(request)
         assert req == REQ
 
+    def test_parse_url_fragment(self):
+        self.endpoint.request_format = "url"
+        request = "{}?{}#frag?x=y".format(
+            self.endpoint_context.issuer, REQ.to_urlencoded()
+        )
+        req = self.endpoint.parse_request(request)
+        assert req == REQ
+
     def test_parse_json(self):
         self.endpoint.request_format = "json"
         request = REQ.to_json()
@@ -99,6 +131,19 @@ class TestEndpoint(object):
         req = self.endpoint.parse_request(request)
         assert req == REQ
 
+    def test_parse_skip_verify(self):
+        self.endpoint.request_cls = AuthorizationRequest
+        self.endpoint.request_format = "json"
+        request = REQ.to_json()
+        req = self.endpoint.parse_request(request)
+        assert isinstance(req, ResponseMessage)
+        assert req["error"] == "invalid_request"
+
+        self.endpoint.skip_verify = True
+        req = self.endpoint.parse_request(request)
+        assert isinstance(req, AuthorizationRequest)
+        assert req["foo"] == "bar"
+
     def test_construct(self):
         msg = self.endpoint.construct(EXAMPLE_MSG, {})
         assert set(msg.keys()) == set(EXAMPLE_MSG.keys())
@@ -160,3 +205,44 @@ class TestEndpoint(object):
         assert parse_res.path == "/cb_i"
         umsg = Message().from_urlencoded(parse_res.fragment)
         assert set(umsg.keys()) == set(EXAMPLE_MSG.keys())
+
+    def test_do_response_http_headers(self):
+        self.endpoint.response_placement = "body"
+        self.endpoint.response_format = "json"
+        _headers = [("Content-type", "text/plain"), ("X-Test", "yes")]
+        msg = self.endpoint.do_response(EXAMPLE_MSG, http_headers=_headers)
+
+        assert msg["http_headers"] == [
+            ("X-Test", "yes"),
+            ("Content-type", "application/json"),
+            ("Pragma", "no-cache"),
+            ("Cache-Control", "no-store"),
+        ]
+        # The caller's list is left as is
+        assert _headers == [("Content-type", "text/plain"), ("X-Test", "yes")]
+
+    def test_do_response_repeated_http_headers(self):
+        self.endpoint.response_placement = "body"
+        self.endpoint.response_format = "json"
+        _headers = [
+            ("Set-Cookie", "a=1"),
+            ("Set-Cookie", "b=2"),
+            ("Cache-Control", "no-store, max-age=0"),
+        ]
+        msg = self.endpoint.do_response(EXAMPLE_MSG, http_headers=_headers)
+
+        assert msg["http_headers"] == [
+            ("Set-Cookie", "a=1"),
+            ("Set-Cookie", "b=2"),
+            ("Cache-Control", "no-store, max-age=0"),
+            ("Content-type", "application/json"),
+            ("Pragma", "no-cache"),
+            ("Cache-Control", "no-store"),
+        ]
+        assert len(_headers) == 3
+
+    def test_do_response_subclass_response_info(self):
+        endpoint = InfoEndpoint(self.endpoint_context)
+        msg = endpoint.do_response(EXAMPLE_MSG)
+        jmsg = json.loads(msg["response"])
+        assert jmsg["extra"] == "value"
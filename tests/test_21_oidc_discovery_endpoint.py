@@ -54,3 +54,15 @@ class TestEndpoint(object):
                 }
             ],
         }
+
+    def test_do_response_quoted_subject(self):
+        args = self.endpoint.process_request({"resource": 'acct:"foo"@example.com'})
+        msg = self.endpoint.do_response(**args)
+        _resp = json.loads(msg["response"])
+        assert _resp["subject"] == 'acct:"foo"@example.com'
+        assert _resp["links"] == [
+            {
+                "href": "https://example.com/",
+                "rel": "http://openid.net/specs/connect/1.0/issuer",
+            }
+        ]
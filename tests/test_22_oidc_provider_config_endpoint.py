@@ -85,3 +85,43 @@ class TestEndpoint(object):
             'birthdate'
         }
         assert ("Content-type", "application/json") in msg["http_headers"]
+
+    def test_do_response_cached(self):
+        args = self.endpoint.process_request()
+        msg = self.endpoint.do_response(args["response_args"])
+        assert self.endpoint.do_response(args["response_args"]) == msg
+
+        # A change to provider_info is reflected in the next response
+        self.endpoint_context.provider_info["service_documentation"] = "https://example.com/doc"
+        msg = self.endpoint.do_response(args["response_args"])
+        _msg = json.loads(msg["response"])
+        assert _msg["service_documentation"] == "https://example.com/doc"
+        assert ("Content-type", "application/json") in msg["http_headers"]
+
+    def test_do_response_cached_different_args(self):
+        msg = self.endpoint.do_response({"issuer": "https://a.example.com"})
+        assert json.loads(msg["response"])["issuer"] == "https://a.example.com"
+        msg = self.endpoint.do_response({"issuer": "https://b.example.com"})
+        assert json.loads(msg["response"])["issuer"] == "https://b.example.com"
+
+    def test_do_response_cached_config_version(self):
+        _constructed = []
+
+        def count(response_args, request, endpoint_context, **kwargs):
+            _constructed.append(1)
+            return response_args
+
+        self.endpoint.pre_construct.append(count)
+        args = self.endpoint.process_request()
+        self.endpoint.do_response(args["response_args"])
+        self.endpoint.do_response(args["response_args"])
+        assert len(_constructed) == 1
+
+        self.endpoint_context.config_version += 1
+        self.endpoint.do_response(args["response_args"])
+        assert len(_constructed) == 2
+
+    def test_do_response_no_args(self):
+        msg = self.endpoint.do_response()
+        assert isinstance(json.loads(msg["response"]), dict)
+        assert ("Content-type", "application/json") in msg["http_headers"]
@@ -194,6 +194,27 @@ class TestEndpoint(object):
 
         assert set(_req.keys()) == {"client_id", "access_token"}
 
+    def test_parse_revoked(self):
+        session_id = setup_session(
+            self.endpoint.endpoint_context,
+            AUTH_REQ,
+            uid="userID",
+            authn_event={
+                "authn_info": "loa1",
+                "uid": "diana",
+                "authn_time": utc_time_sans_frac(),
+                "valid_until": utc_time_sans_frac() + 3600,
+            },
+        )
+        _sdb = self.endpoint.endpoint_context.sdb
+        _dic = _sdb.upgrade_to_token(key=session_id)
+        _auth = "Bearer {}".format(_dic["access_token"])
+        self.endpoint.parse_request({}, auth=_auth)
+
+        _sdb.revoke_session(sid=session_id)
+        with pytest.raises(ValueError):
+            self.endpoint.parse_request({}, auth=_auth)
+
     def test_process_request(self):
         session_id = setup_session(
             self.endpoint.endpoint_context,